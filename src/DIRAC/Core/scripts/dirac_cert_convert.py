@@ -4,6 +4,7 @@ Script converts the user certificate in the p12 format into a standard .globus u
 Creates the necessary directory, $HOME/.globus, if needed. Backs-up old pem files if any are found.
 """
 import os
+import re
 import sys
 import shutil
 import subprocess
@@ -14,6 +15,29 @@ from tempfile import TemporaryDirectory
 from DIRAC import gLogger
 from DIRAC.Core.Base.Script import Script
 
+# a PEM block, with its label (e.g. "CERTIFICATE" or "ENCRYPTED PRIVATE KEY")
+PEM_BLOCK_RE = re.compile(r"-----BEGIN ([A-Z0-9 ]+)-----\n.*?-----END \1-----\n?", re.DOTALL)
+
+
+def splitPEMBlocks(pemText):
+    """Split the PEM output of "openssl pkcs12" into certificates and private keys.
+    Anything outside the PEM blocks, like the "Bag Attributes", is left out.
+
+    :param str pemText: PEM content
+    :return: tuple (list of certificate blocks, list of private key blocks)
+    """
+    certBlocks = []
+    keyBlocks = []
+    for match in PEM_BLOCK_RE.finditer(pemText):
+        label = match.group(1)
+        # the last block of a file may lack its final newline
+        block = match.group(0).rstrip("\n") + "\n"
+        if label == "CERTIFICATE":
+            certBlocks.append(block)
+        elif label.endswith("PRIVATE KEY"):
+            keyBlocks.append(block)
+    return certBlocks, keyBlocks
+
 
 @Script()
 def main():
@@ -43,6 +67,12 @@ def main():
         gLogger.fatal(f"{p12} does not exist.")
         sys.exit(1)
 
+    # check for openssl before any existing pem file is backed up
+    openssl = shutil.which("openssl")
+    if not openssl:
+        gLogger.fatal("openssl command not found")
+        sys.exit(1)
+
     globus = os.path.join(os.environ["HOME"], ".globus")
     if not os.path.isdir(globus):
         gLogger.notice(f"Creating {globus} directory")
@@ -58,16 +88,36 @@ def main():
             shutil.move(old, old + nowPrefix)
 
     # new OpenSSL version require OPENSSL_CONF to point to some accessible location',
+    # (set it only for the time of the conversion rather than copying the whole environment)
     with TemporaryDirectory() as tmpdir:
-        env = os.environ | {"OPENSSL_CONF": tmpdir}
-        gLogger.notice("Converting p12 key to pem format")
-        cmd = ["openssl", "pkcs12", "-nocerts", "-in", p12, "-out", key, legacy]
-        res = run(cmd, env=env, check=False, timeout=900, text=True, stdout=PIPE, stderr=STDOUT)
-        # The last command was successful
-        if res.returncode == 0:
-            gLogger.notice("Converting p12 certificate to pem format")
-            cmd = ["openssl", "pkcs12", "-clcerts", "-nokeys", "-in", p12, "-out", cert, legacy]
-            res = run(cmd, env=env, check=False, timeout=900, text=True, stdout=PIPE, stderr=STDOUT)
+        previousConf = os.environ.get("OPENSSL_CONF")
+        os.environ["OPENSSL_CONF"] = tmpdir
+        try:
+            # A single openssl call decrypts the p12 (the key stays encrypted in the output),
+            # the certificate and the key are then split from its output
+            gLogger.notice("Converting p12 certificate and key to pem format")
+            pemBundle = os.path.join(tmpdir, "usercred.pem")
+            cmd = [openssl, "pkcs12", "-clcerts", "-in", p12, "-out", pemBundle]
+            if legacy:
+                cmd.append(legacy)
+            res = run(cmd, check=False, timeout=900, text=True, stdout=PIPE, stderr=STDOUT)
+            # The last command was successful
+            if res.returncode == 0:
+                with open(pemBundle) as fd:
+                    certBlocks, keyBlocks = splitPEMBlocks(fd.read())
+                if certBlocks and keyBlocks:
+                    with open(os.open(key, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as fd:
+                        fd.writelines(keyBlocks)
+                    with open(cert, "w") as fd:
+                        fd.writelines(certBlocks)
+                else:
+                    res.returncode = 1
+                    res.stdout += f"No certificate and key found in {p12}\n"
+        finally:
+            if previousConf is None:
+                os.environ.pop("OPENSSL_CONF", None)
+            else:
+                os.environ["OPENSSL_CONF"] = previousConf
     # Something went wrong
     if res.returncode != 0:
         gLogger.fatal(res.stdout)
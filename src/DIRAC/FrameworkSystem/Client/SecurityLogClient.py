@@ -2,6 +2,7 @@
 """
 import syslog
 import datetime
+from collections import deque
 
 from DIRAC import gLogger, gConfig
 from DIRAC.Core.Base.Client import Client
@@ -12,9 +13,10 @@ class SecurityLogClient:
     __securityLogStore = []
 
     def __init__(self):
-        self.__messagesList = []
         self.__maxMessagesInBundle = 1000
         self.__maxMessagesWaiting = 10000
+        # bounded buffer: the oldest messages are dropped once maxMessagesWaiting is reached
+        self.__messagesList = deque(maxlen=self.__maxMessagesWaiting)
         self.__taskId = gThreadScheduler.addPeriodicTask(30, self.__sendData)
 
     def addMessage(
@@ -45,8 +47,6 @@ class SecurityLogClient:
         if gConfig.getValue("/Registry/EnableSysLog", False):
             strMsg = "Time=%s Accept=%s Source=%s:%s SourceID=%s Destination=%s:%s Service=%s Action=%s"
             syslog.syslog(strMsg % msg)
-        while len(self.__messagesList) > self.__maxMessagesWaiting:
-            self.__messagesList.pop(0)
         if not self.__securityLogStore:
             self.__messagesList.append(msg)
         else:
@@ -61,13 +61,13 @@ class SecurityLogClient:
     def __sendData(self):
         gLogger.debug("Sending records to security log service...")
         msgList = self.__messagesList
-        self.__messagesList = []
+        self.__messagesList = deque(maxlen=self.__maxMessagesWaiting)
         rpcClient = Client(url="Framework/SecurityLogging")
-        for _i in range(0, len(msgList), self.__maxMessagesInBundle):
-            msgsToSend = msgList[: self.__maxMessagesInBundle]
+        while msgList:
+            msgsToSend = [msgList.popleft() for _i in range(min(len(msgList), self.__maxMessagesInBundle))]
             result = rpcClient.logActionBundle(msgsToSend)
             if not result["OK"]:
+                self.__messagesList.extend(msgsToSend)
                 self.__messagesList.extend(msgList)
                 break
-            msgList = msgList[self.__maxMessagesInBundle :]
         gLogger.debug("Data sent to security log service")
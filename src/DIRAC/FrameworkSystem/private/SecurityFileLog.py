@@ -2,9 +2,9 @@ import os
 import re
 import time
 import gzip
-import queue
 import shutil
 import threading
+from collections import deque
 from DIRAC import gLogger, S_OK, S_ERROR
 from DIRAC.Core.Utilities.ThreadScheduler import gThreadScheduler
 from DIRAC.Core.Utilities.File import mkDir
@@ -13,7 +13,14 @@ from DIRAC.Core.Utilities.File import mkDir
 class SecurityFileLog(threading.Thread):
     def __init__(self, basePath, daysToLog=100):
         self.__basePath = basePath
-        self.__messagesQueue = queue.Queue()
+        # messages are handed over to the writer thread through a deque guarded by a single condition
+        self.__messagesQueue = deque()
+        self.__messagesCondition = threading.Condition()
+        # a bundle is written as soon as it is full or when its first message is older than this (in seconds)
+        self.__maxBundledMsgs = 1000
+        self.__maxBundleLatency = 0.1
+        # time.monotonic() at which the oldest pending message was queued
+        self.__bundleStartTime = 0
         self.__requiredFields = (
             "timestamp",
             "success",
@@ -35,11 +42,31 @@ class SecurityFileLog(threading.Thread):
 
     def run(self):
         while True:
-            secMsg = self.__messagesQueue.get()
+            # logAction only wakes the writer for the first message of a bundle and when the bundle is full,
+            # otherwise it sleeps until the latency of the first message is reached
+            with self.__messagesCondition:
+                self.__messagesCondition.wait_for(lambda: self.__messagesQueue)
+                # messages left over from a full bundle keep their start time, so they do not wait again
+                self.__messagesCondition.wait_for(
+                    lambda: len(self.__messagesQueue) >= self.__maxBundledMsgs,
+                    timeout=self.__bundleStartTime + self.__maxBundleLatency - time.monotonic(),
+                )
+                bundle = [
+                    self.__messagesQueue.popleft()
+                    for _i in range(min(len(self.__messagesQueue), self.__maxBundledMsgs))
+                ]
+            self.__writeBundle(bundle)
+
+    def __writeBundle(self, bundle):
+        # group the messages per daily log file so that each file is opened only once per bundle
+        linesPerFile = {}
+        for secMsg in bundle:
             msgTime = secMsg[0]
             path = "%s/%s/%02d" % (self.__basePath, msgTime.year, msgTime.month)
-            mkDir(path)
             logFile = "%s/%s%02d%02d.security.log.csv" % (path, msgTime.year, msgTime.month, msgTime.day)
+            linesPerFile.setdefault((path, logFile), []).append(f"{', '.join([str(item) for item in secMsg])}\n")
+        for (path, logFile), lines in linesPerFile.items():
+            mkDir(path)
             if not os.path.isfile(logFile):
                 fd = open(logFile, "w")
                 fd.write(
@@ -48,7 +75,7 @@ class SecurityFileLog(threading.Thread):
                 )
             else:
                 fd = open(logFile, "a")
-            fd.write(f"{', '.join([str(item) for item in secMsg])}\n")
+            fd.writelines(lines)
             fd.close()
 
     def __launchCleaningOldLogFiles(self):
@@ -107,5 +134,13 @@ class SecurityFileLog(threading.Thread):
     def logAction(self, msg):
         if len(msg) != len(self.__requiredFields):
             return S_ERROR(f"Mismatch in the msg size, it should be {len(self.__requiredFields)} and it's {len(msg)}")
-        self.__messagesQueue.put(msg)
+        with self.__messagesCondition:
+            if not self.__messagesQueue:
+                self.__bundleStartTime = time.monotonic()
+                self.__messagesQueue.append(msg)
+                self.__messagesCondition.notify()
+            else:
+                self.__messagesQueue.append(msg)
+                if len(self.__messagesQueue) >= self.__maxBundledMsgs:
+                    self.__messagesCondition.notify()
         return S_OK()
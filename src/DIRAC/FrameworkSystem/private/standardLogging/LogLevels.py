@@ -52,6 +52,8 @@ class LogLevels:
         "ALWAYS": ALWAYS,
         "FATAL": FATAL,
     }
+    # reverse mapping, so that getLevel does not have to go through every level
+    __levelNameDict = {value: name for name, value in __levelDict.items()}
 
     @classmethod
     def getLevelValue(cls, sName: str) -> int | None:
@@ -73,10 +75,7 @@ class LogLevels:
         :param int level: level value
         :return: a level name according to a level value
         """
-        for lev in cls.__levelDict:
-            if cls.__levelDict[lev] == level:
-                return lev
-        return None
+        return cls.__levelNameDict.get(level)
 
     @classmethod
     def getLevelNames(cls) -> list[str]:
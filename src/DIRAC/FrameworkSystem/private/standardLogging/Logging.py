@@ -254,10 +254,10 @@ class Logging:
         # lock to prevent a level change
         self._lockLevel.acquire()
         try:
-            result = False
-            if levelName.upper() in LogLevels.getLevelNames():
-                result = LogLevels.getLevelValue(self.getLevel()) <= LogLevels.getLevelValue(levelName)
-            return result
+            levelValue = LogLevels.getLevelValue(levelName)
+            if levelValue is None:
+                return False
+            return self._logger.getEffectiveLevel() <= levelValue
         finally:
             self._lockLevel.release()
 
@@ -371,7 +371,9 @@ class Logging:
         """
         Create a log record according to the level of the message.
 
-        - The log record is always sent to the different backends
+        - Messages below the effective level of the logger are dropped straight away,
+          before the level lock is taken and the extra attributes are built
+        - Otherwise, the log record is sent to the different backends
         - Backends have their own levels and may manage the display of the log record
 
         :param int level: level of the log record
@@ -383,6 +385,10 @@ class Logging:
 
         :return: boolean representing the result of the log record creation
         """
+        # drop the message straight away if the logger would discard it anyway:
+        # no lock and no extra dictionary are needed for it
+        if not self._logger.isEnabledFor(level):
+            return False
 
         # lock to prevent a level change after that the log is sent.
         self._lockLevel.acquire()
@@ -409,8 +415,9 @@ class Logging:
                 extra.update(local_context)
 
             self._logger.log(level, "%s", sMsg, exc_info=exc_info, extra=extra)
-            # check whether the message is displayed
-            isSent = LogLevels.getLevelValue(self.getLevel()) <= level
+            # check whether the message is displayed: levels are compared as integers,
+            # without going through their names
+            isSent = self._logger.getEffectiveLevel() <= level
             return isSent
         finally:
             self._lockLevel.release()
@@ -0,0 +1,85 @@
+""" Test for SecurityFileLog
+"""
+# pylint: disable=protected-access
+import datetime
+import os
+import time
+
+import pytest
+
+from DIRAC.FrameworkSystem.private.SecurityFileLog import SecurityFileLog
+
+
+def secMsg(msgTime, action):
+    """Build a security message as sent by the SecurityLogClient"""
+    return [msgTime, True, "1.2.3.4", 1234, "/DC=ch/CN=user", "5.6.7.8", 9135, "Framework/SecurityLogging", action]
+
+
+def readLogFile(logFile, nLines, timeout=10):
+    """Wait until the writer thread has put nLines lines in logFile and return them"""
+    endTime = time.monotonic() + timeout
+    while time.monotonic() < endTime:
+        if os.path.isfile(logFile):
+            with open(logFile) as fd:
+                lines = fd.readlines()
+            if len(lines) >= nLines:
+                return lines
+        time.sleep(0.05)
+    pytest.fail(f"{logFile} does not contain {nLines} lines after {timeout} seconds")
+
+
+@pytest.fixture
+def securityFileLog(mocker, tmp_path):
+    mocker.patch("DIRAC.FrameworkSystem.private.SecurityFileLog.gThreadScheduler")
+    return SecurityFileLog(str(tmp_path))
+
+
+def test_manyMessages(securityFileLog, tmp_path):
+    """More messages than fit in one bundle are all written, in order, below a single header"""
+    msgTime = datetime.datetime(2024, 5, 17, 12)
+    nMessages = 2 * securityFileLog._SecurityFileLog__maxBundledMsgs + 500
+    messages = [secMsg(msgTime, f"action{i}") for i in range(nMessages)]
+    for msg in messages:
+        assert securityFileLog.logAction(msg)["OK"]
+
+    lines = readLogFile(os.path.join(tmp_path, "2024", "05", "20240517.security.log.csv"), nMessages + 1)
+
+    assert len(lines) == nMessages + 1
+    assert lines[0].startswith("Time, Success, Source IP")
+    assert lines[1:] == [f"{', '.join(str(item) for item in msg)}\n" for msg in messages]
+
+
+def test_dailyFiles(securityFileLog, tmp_path):
+    """Messages of different days go to their own daily file"""
+    days = [datetime.datetime(2024, 5, 31, 23, 59), datetime.datetime(2024, 6, 1, 0, 1)]
+    for i in range(10):
+        assert securityFileLog.logAction(secMsg(days[i % 2], f"action{i}"))["OK"]
+
+    mayLines = readLogFile(os.path.join(tmp_path, "2024", "05", "20240531.security.log.csv"), 6)
+    juneLines = readLogFile(os.path.join(tmp_path, "2024", "06", "20240601.security.log.csv"), 6)
+
+    for lines, actions in ((mayLines, range(0, 10, 2)), (juneLines, range(1, 10, 2))):
+        assert len(lines) == 6
+        assert lines[0].startswith("Time, Success, Source IP")
+        assert [line.rstrip("\n").split(", ")[-1] for line in lines[1:]] == [f"action{i}" for i in actions]
+
+
+def test_singleMessage(securityFileLog, tmp_path):
+    """A lone message is written once the maximum bundle latency is reached"""
+    securityFileLog._SecurityFileLog__maxBundleLatency = 0.5
+    logFile = os.path.join(tmp_path, "2024", "05", "20240517.security.log.csv")
+    startTime = time.monotonic()
+    assert securityFileLog.logAction(secMsg(datetime.datetime(2024, 5, 17, 12), "action"))["OK"]
+
+    time.sleep(0.2)
+    assert not os.path.exists(logFile)
+    lines = readLogFile(logFile, 2)
+
+    assert 0.5 <= time.monotonic() - startTime < 5
+    assert len(lines) == 2
+    assert lines[1].rstrip("\n").endswith(", action")
+
+
+def test_wrongMessageSize(securityFileLog):
+    """Messages without all the required fields are refused"""
+    assert not securityFileLog.logAction(["too", "short"])["OK"]
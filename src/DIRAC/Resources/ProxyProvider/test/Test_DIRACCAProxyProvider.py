@@ -2,16 +2,8 @@
 """
 # pylint: disable=invalid-name,wrong-import-position,protected-access
 import os
-import re
 import sys
 import shutil
-
-# TODO: This should be modernised to use subprocess(32)
-try:
-    import commands
-except ImportError:
-    # Python 3's subprocess module contains a compatibility layer
-    import subprocess as commands
 import unittest
 import tempfile
 
@@ -54,9 +46,10 @@ class DIRACCAProviderTestCase(unittest.TestCase):
         lines = []
         with open(testCAConfigFile) as caCFG:
             for line in caCFG:
-                if re.findall("=", re.sub(r"#.*", "", line)):
-                    # Ignore comments
-                    field = re.sub(r"#.*", "", line).replace(" ", "").rstrip().split("=")[0]
+                # Ignore comments
+                content = line.split("#", 1)[0]
+                if "=" in content:
+                    field = content.split("=", 1)[0].strip()
                     # Put the right dir
                     line = f"dir = {testCAPath} #PUT THE RIGHT DIR HERE!\n" if field == "dir" else line
                 lines.append(line)
@@ -65,10 +58,7 @@ class DIRACCAProviderTestCase(unittest.TestCase):
             caCFG.writelines(lines)
 
         # Result
-        status, output = commands.getstatusoutput(f"ls -al {testCAPath}")
-        if status:
-            gLogger.error(output)
-            exit()
+        output = "\n".join(f"{entry.name} {entry.stat().st_size}" for entry in os.scandir(testCAPath))
         gLogger.debug("Test path:\n", output)
 
     def setUp(self):
@@ -4,7 +4,6 @@
 
 import hashlib
 import os
-import re
 import tarfile
 import tempfile
 from io import BytesIO, StringIO
@@ -17,10 +16,46 @@ from DIRAC.Core.Utilities.File import getGlobbedTotalSize, mkDir
 from DIRAC.Core.Utilities.ReturnValues import returnSingleResult
 from DIRAC.Resources.Storage.StorageElement import StorageElement
 
+# SandboxMetadataDB for direct access: once it could be connected to, it is shared by all the clients
+gSandboxMetadataDB = None
+
+
+def _getSandboxMetadataDB():
+    """Get the SandboxMetadataDB object for direct access, connecting to it the first time only
+
+    :return: SandboxMetadataDB object, or False if it is not available
+    """
+    global gSandboxMetadataDB
+    if gSandboxMetadataDB is None:
+        # the DB is imported here to keep the DB dependencies away from the plain clients
+        try:
+            from DIRAC.WorkloadManagementSystem.DB.SandboxMetadataDB import SandboxMetadataDB
+
+            smdb = SandboxMetadataDB()
+            result = smdb._getConnection()  # pylint: disable=protected-access
+        except (ImportError, RuntimeError, AttributeError):
+            return False
+        if not result["OK"]:
+            return False
+        result["Value"].close()
+        gSandboxMetadataDB = smdb
+    return gSandboxMetadataDB
+
+
+class _HashingFileWriter:
+    """Write-only file wrapper computing the MD5 of the data on its way to the file"""
+
+    def __init__(self, fileObj):
+        self.__fileObj = fileObj
+        self.md5 = hashlib.md5()
+
+    def write(self, data):
+        self.md5.update(data)
+        return self.__fileObj.write(data)
+
 
 class SandboxStoreClient:
     __validSandboxTypes = ("Input", "Output")
-    __smdb = None
 
     def __init__(self, rpcClient=None, transferClient=None, smdb=False, **kwargs):
         """Constructor
@@ -37,21 +72,11 @@ class SandboxStoreClient:
         self.__transferClient = transferClient
         self.__kwargs = kwargs
         self.__vo = None
-        SandboxStoreClient.__smdb = smdb
+        self.__smdb = smdb
         if "delegatedGroup" in kwargs:
             self.__vo = getVOForGroup(kwargs["delegatedGroup"])
-        if SandboxStoreClient.__smdb is True:
-            try:
-                from DIRAC.WorkloadManagementSystem.DB.SandboxMetadataDB import SandboxMetadataDB
-
-                SandboxStoreClient.__smdb = SandboxMetadataDB()
-                result = SandboxStoreClient.__smdb._getConnection()  # pylint: disable=protected-access
-                if not result["OK"]:
-                    SandboxStoreClient.__smdb = False
-                else:
-                    result["Value"].close()
-            except (ImportError, RuntimeError, AttributeError):
-                SandboxStoreClient.__smdb = False
+        if smdb is True:
+            self.__smdb = _getSandboxMetadataDB()
 
     def __getRPCClient(self):
         """Get an RPC client for SB service"""
@@ -82,7 +107,7 @@ class SandboxStoreClient:
         a fileList item can be:
           - a string, which is an lfn name
           - a file name (real), that is supposed to be on disk, in the current directory
-          - a fileObject that should be a BytesIO type of object
+          - a fileObject that should be a BytesIO (or StringIO) type of object, added as jobDescription.xml
 
         Parameters:
           - assignTo : Dict containing { 'Job:<jobid>' : '<sbType>', ... }
@@ -101,7 +126,7 @@ class SandboxStoreClient:
 
         for sFile in fileList:
             if isinstance(sFile, str):
-                if re.search("^lfn:", sFile, flags=re.IGNORECASE):
+                if sFile[:4].lower() == "lfn:":
                     pass
                 else:
                     if os.path.exists(sFile):
@@ -109,7 +134,7 @@ class SandboxStoreClient:
                     else:
                         errorFiles.append(sFile)
 
-            elif isinstance(sFile, StringIO):
+            elif isinstance(sFile, (StringIO, BytesIO)):
                 files2Upload.append(sFile)
             else:
                 return S_ERROR(f"Objects of type {type(sFile)} can't be part of InputSandbox")
@@ -123,17 +148,26 @@ class SandboxStoreClient:
         except Exception as e:
             return S_ERROR(f"Cannot create temporary file: {repr(e)}")
 
-        with tarfile.open(name=tmpFilePath, mode="w|bz2") as tf:
-            for sFile in files2Upload:
-                if isinstance(sFile, str):
-                    tf.add(os.path.realpath(sFile), os.path.basename(sFile), recursive=True)
-                elif isinstance(sFile, StringIO):
-                    tarInfo = tarfile.TarInfo(name="jobDescription.xml")
-                    value = sFile.getvalue().encode()
-                    tarInfo.size = len(value)
-                    tf.addfile(tarinfo=tarInfo, fileobj=BytesIO(value))
-                else:
-                    return S_ERROR(f"Unknown type to upload: {repr(sFile)}")
+        # The checksum is computed while the archive is written, so that it does not have to be read back.
+        # The format stays bz2 for the server side, but with the fastest (smallest block) compression level
+        with open(tmpFilePath, "wb") as tmpFile:
+            hashingFile = _HashingFileWriter(tmpFile)
+            with tarfile.open(name=tmpFilePath, mode="w:bz2", fileobj=hashingFile, compresslevel=1) as tf:
+                for sFile in files2Upload:
+                    if isinstance(sFile, str):
+                        tf.add(os.path.realpath(sFile), os.path.basename(sFile), recursive=True)
+                    elif isinstance(sFile, (StringIO, BytesIO)):
+                        tarInfo = tarfile.TarInfo(name="jobDescription.xml")
+                        if isinstance(sFile, StringIO):
+                            # the only copy is the encoding: BytesIO shares the bytes it is given
+                            sFile = BytesIO(sFile.getvalue().encode())
+                        # size from the stream end rather than getbuffer(), which would unshare (copy) the bytes
+                        tarInfo.size = sFile.seek(0, os.SEEK_END)
+                        sFile.seek(0)
+                        tf.addfile(tarinfo=tarInfo, fileobj=sFile)
+                    else:
+                        return S_ERROR(f"Unknown type to upload: {repr(sFile)}")
+        oMD5 = hashingFile.md5
 
         if sizeLimit > 0:
             # Evaluate the compressed size of the sandbox
@@ -142,13 +176,6 @@ class SandboxStoreClient:
                 result["SandboxFileName"] = tmpFilePath
                 return result
 
-        oMD5 = hashlib.md5()
-        with open(tmpFilePath, "rb") as fd:
-            bData = fd.read(10240)
-            while bData:
-                oMD5.update(bData)
-                bData = fd.read(10240)
-
         transferClient = self.__getTransferClient()
         result = transferClient.sendFile(tmpFilePath, [f"{oMD5.hexdigest()}.tar.bz2", assignTo])
         result["SandboxFileName"] = tmpFilePath
@@ -214,7 +241,8 @@ class SandboxStoreClient:
 
         try:
             sandboxSize = 0
-            with tarfile.open(name=tarFileName, mode="r") as tf:
+            # stream mode: the archive is decompressed in a single sequential pass while extracting
+            with tarfile.open(name=tarFileName, mode="r|*") as tf:
                 for tarinfo in tf:
                     tf.extract(tarinfo, path=destinationDir)
                     sandboxSize += tarinfo.size
@@ -245,8 +273,8 @@ class SandboxStoreClient:
         for sbT in sbList:
             if sbT[1] not in self.__validSandboxTypes:
                 return S_ERROR(f"Invalid Sandbox type {sbT[1]}")
-        if SandboxStoreClient.__smdb and ownerName and ownerGroup:
-            return SandboxStoreClient.__smdb.assignSandboxesToEntities({eId: sbList}, ownerName, ownerGroup)
+        if self.__smdb and ownerName and ownerGroup:
+            return self.__smdb.assignSandboxesToEntities({eId: sbList}, ownerName, ownerGroup)
         return self.__getRPCClient().assignSandboxesToEntities({eId: sbList}, ownerName, ownerGroup)
 
     def unassignJobs(self, jobIdList):
@@ -2,13 +2,16 @@
 """
 # pylint: disable=protected-access, missing-docstring, invalid-name, line-too-long
 
+import hashlib
 import os
-from io import BytesIO
+import sys
+import tarfile
+from io import BytesIO, StringIO
 
 import pytest
 from unittest.mock import MagicMock
 
-from DIRAC import gLogger
+from DIRAC import gLogger, S_OK, S_ERROR
 
 gLogger.setLevel("DEBUG")
 
@@ -79,9 +82,107 @@ def test__processResourceDescription(setUp):
     assert res == resExpected
 
 
-def test_uploadFilesAsSandbox(mocker, setUp):
-    mocker.patch("DIRAC.WorkloadManagementSystem.Client.SandboxStoreClient.TransferClient", return_value=MagicMock())
+@pytest.mark.parametrize("sandboxFile", [BytesIO(b"try"), StringIO("try")])
+def test_uploadFilesAsSandbox(mocker, setUp, sandboxFile):
+    sentSandbox = {}
+
+    def sendFile(fileName, _fileId):
+        # the archive is removed once sent: look at it while it is there
+        with open(fileName, "rb") as fd:
+            sentSandbox["md5"] = hashlib.md5(fd.read()).hexdigest()
+        with tarfile.open(fileName, mode="r:bz2") as tf:
+            sentSandbox["content"] = {member.name: tf.extractfile(member).read() for member in tf.getmembers()}
+        return S_OK()
+
+    transferClientMock = mocker.patch("DIRAC.WorkloadManagementSystem.Client.SandboxStoreClient.TransferClient")
+    transferClientMock.return_value.sendFile.side_effect = sendFile
+    ssc = SandboxStoreClient()
+    res = ssc.uploadFilesAsSandbox([sandboxFile])
+
+    assert res["OK"]
+    transferClientMock.return_value.sendFile.assert_called_once_with(
+        res["SandboxFileName"], [f"{sentSandbox['md5']}.tar.bz2", {}]
+    )
+    assert sentSandbox["content"] == {"jobDescription.xml": b"try"}
+    assert not os.path.exists(res["SandboxFileName"])
+
+
+def test_downloadSandbox(mocker, setUp, tmp_path):
+    sePFN = "/vo/user/SandBox/sb.tar.bz2"
+
+    # a sandbox with a file, a directory and a symlink
+    sourceDir = tmp_path / "source"
+    sourceDir.mkdir()
+    (sourceDir / "std.out").write_bytes(b"output")
+    (sourceDir / "results").mkdir()
+    (sourceDir / "results" / "data.txt").write_bytes(b"some data")
+    os.symlink("std.out", sourceDir / "latest.out")
+    sandboxArchive = tmp_path / "sb.tar.bz2"
+    with tarfile.open(sandboxArchive, mode="w:bz2") as tf:
+        for name in ["std.out", "results", "latest.out"]:
+            tf.add(sourceDir / name, arcname=name)
+
+    def getFile(lfn, localPath):
+        with open(sandboxArchive, "rb") as src, open(os.path.join(localPath, os.path.basename(lfn)), "wb") as dst:
+            dst.write(src.read())
+        return S_OK({"Successful": {lfn: os.path.getsize(sandboxArchive)}, "Failed": {}})
+
+    storageElementMock = mocker.patch("DIRAC.WorkloadManagementSystem.Client.SandboxStoreClient.StorageElement")
+    storageElementMock.return_value.getFile.side_effect = getFile
+    destinationDir = tmp_path / "destination"
     ssc = SandboxStoreClient()
-    fileList = [BytesIO(b"try")]
-    res = ssc.uploadFilesAsSandbox(fileList)
-    print(res)
+    res = ssc.downloadSandbox(f"SB:SandboxSE|{sePFN}", str(destinationDir))
+
+    assert res["OK"]
+    assert storageElementMock.call_args.args == ("SandboxSE",)
+    # directories and symlinks do not count in the size
+    assert res["Value"] == len(b"output") + len(b"some data")
+    assert (destinationDir / "std.out").read_bytes() == b"output"
+    assert (destinationDir / "results" / "data.txt").read_bytes() == b"some data"
+    assert os.readlink(destinationDir / "latest.out") == "std.out"
+    assert (destinationDir / "latest.out").read_bytes() == b"output"
+    # the downloaded archive and its temporary directory are removed
+    localPath = storageElementMock.return_value.getFile.call_args.kwargs["localPath"]
+    assert not os.path.exists(localPath)
+
+
+@pytest.fixture
+def sandboxMetadataDBMock(mocker):
+    """Replace the SandboxMetadataDB module, and reset the DB object shared by the SandboxStoreClients"""
+    smdbModule = MagicMock()
+    mocker.patch.dict(sys.modules, {"DIRAC.WorkloadManagementSystem.DB.SandboxMetadataDB": smdbModule})
+    mocker.patch("DIRAC.WorkloadManagementSystem.Client.SandboxStoreClient.gSandboxMetadataDB", None)
+    return smdbModule.SandboxMetadataDB
+
+
+def test_sandboxMetadataDBProbedOnce(sandboxMetadataDBMock):
+    sandboxMetadataDBMock.return_value._getConnection.return_value = S_OK(MagicMock())
+
+    firstClient = SandboxStoreClient(smdb=True)
+    secondClient = SandboxStoreClient(smdb=True)
+
+    assert sandboxMetadataDBMock.call_count == 1
+    assert sandboxMetadataDBMock.return_value._getConnection.call_count == 1
+    assert firstClient._SandboxStoreClient__smdb is sandboxMetadataDBMock.return_value
+    assert secondClient._SandboxStoreClient__smdb is sandboxMetadataDBMock.return_value
+
+
+def test_sandboxMetadataDBFailedProbeNotCached(sandboxMetadataDBMock):
+    sandboxMetadataDBMock.return_value._getConnection.side_effect = [S_ERROR("No DB"), S_OK(MagicMock())]
+
+    firstClient = SandboxStoreClient(smdb=True)
+    secondClient = SandboxStoreClient(smdb=True)
+
+    assert firstClient._SandboxStoreClient__smdb is False
+    assert secondClient._SandboxStoreClient__smdb is sandboxMetadataDBMock.return_value
+    assert sandboxMetadataDBMock.return_value._getConnection.call_count == 2
+
+
+def test_sandboxMetadataDBPerClient(sandboxMetadataDBMock):
+    sandboxMetadataDBMock.return_value._getConnection.return_value = S_OK(MagicMock())
+
+    smdbClient = SandboxStoreClient(smdb=True)
+    defaultClient = SandboxStoreClient()
+
+    assert smdbClient._SandboxStoreClient__smdb is sandboxMetadataDBMock.return_value
+    assert defaultClient._SandboxStoreClient__smdb is False
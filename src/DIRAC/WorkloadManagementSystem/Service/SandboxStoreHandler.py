@@ -123,10 +123,7 @@ class SandboxStoreHandlerMixin:
                     return result
                 tar_fh.seek(0)
 
-                hasher = hashlib.sha256()
-                while data := tar_fh.read(512 * 1024):
-                    hasher.update(data)
-                checksum = hasher.hexdigest()
+                checksum = hashlib.file_digest(tar_fh, "sha256").hexdigest()
                 tar_fh.seek(0)
                 gLogger.debug("Sandbox checksum is", checksum)
 
@@ -206,13 +203,8 @@ class SandboxStoreHandlerMixin:
         if fileHelper:
             hdHash = fileHelper.getHash()
         else:
-            oMD5 = hashlib.md5()
-            with open(hdPath, "rb") as fd:
-                bData = fd.read(10240)
-                while bData:
-                    oMD5.update(bData)
-                    bData = fd.read(10240)
-            hdHash = oMD5.hexdigest()
+            # the file was just written from data, no need to read it back
+            hdHash = hashlib.md5(data).hexdigest()
         if hdHash != aHash:
             self.__secureUnlinkFile(hdPath)
             gLogger.error("Hashes don't match! Client defined hash is different with received data hash!")